@@ -3,9 +3,23 @@ import argparse
 import os
 import sys
 import glob
+from concurrent.futures import ProcessPoolExecutor
 from oscgv.parser import parse_svg
-from scipy.io.wavfile import write
-from oscgv.audio import generate_signal, stream_audio, save_wav, stream_audio_live, generate_show, stream_show_live, generate_animation
+from oscgv.audio import generate_signal, stream_audio, save_wav, write_wav, stream_audio_live, generate_show, stream_show_live, generate_animation
+
+def _load_one(file_path, sample_rate, refresh_rate, transit_speed, animate):
+    """
+    Parses one SVG and generates its loop signal and, if animate > 0, its entry animation.
+    Runs in a worker process in show mode.
+    """
+    p = parse_svg(file_path)
+    # Generate base signal (1 cycle)
+    s = generate_signal(p, sample_rate=sample_rate, refresh_rate=refresh_rate, transit_speed=transit_speed)
+    
+    a = None
+    if animate > 0:
+        a = generate_animation(p, animate, sample_rate=sample_rate, refresh_rate=refresh_rate, transit_speed=transit_speed)
+    return s, a
 
 def main():
     parser = argparse.ArgumentParser(description="Convert SVG to Oscilloscope Audio (XY)")
@@ -19,6 +33,7 @@ def main():
     parser.add_argument("--play", action="store_true", help="Play audio to default output device")
     parser.add_argument("--live", action="store_true", help="Live mode: watch input file and update real-time")
     parser.add_argument("--output", help="Output WAV file path")
+    parser.add_argument("--wav-format", choices=["int16", "float32"], default="int16", help="Sample format of the output WAV file (default: int16)")
     parser.add_argument("--preview", action="store_true", help="Show a plot of the generated signal (requires matplotlib)")
 
     args = parser.parse_args()
@@ -44,22 +59,21 @@ def main():
         print(f"Found {len(svg_files)} SVGs.")
         signals = []
         animations = []
-        for f in svg_files:
-            try:
-                p = parse_svg(f)
-                # Generate base signal (1 cycle)
-                s = generate_signal(p, sample_rate=args.sample_rate, refresh_rate=args.refresh_rate, transit_speed=args.transit_speed)
-                signals.append(s)
-                
-                if args.animate > 0:
-                    a = generate_animation(p, args.animate, sample_rate=args.sample_rate, refresh_rate=args.refresh_rate, transit_speed=args.transit_speed)
+        # Files are independent: parse and generate them in parallel worker processes
+        # (svgpathtools is pure Python, so threads would serialize on the GIL).
+        # Results are collected in file order to keep the show sequence.
+        workers = min(len(svg_files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_load_one, f, args.sample_rate, args.refresh_rate, args.transit_speed, args.animate)
+                       for f in svg_files]
+            for f, fut in zip(svg_files, futures):
+                try:
+                    s, a = fut.result()
+                    signals.append(s)
                     animations.append(a)
-                else:
-                    animations.append(None)
-                    
-                print(f"Loaded {os.path.basename(f)}")
-            except Exception as e:
-                print(f"Skipping {f}: {e}")
+                    print(f"Loaded {os.path.basename(f)}")
+                except Exception as e:
+                    print(f"Skipping {f}: {e}")
         
         if not signals:
             print("No valid signals generated.")
@@ -82,15 +96,17 @@ def main():
             print(f"Error parsing SVG: {e}")
             sys.exit(1)
 
-        print(f"Generating signal ({len(paths)} paths)...")
+        print(f"Generating signal ({len(paths[1]) - 1} paths)...")
         signal = generate_signal(paths, sample_rate=args.sample_rate, refresh_rate=args.refresh_rate, transit_speed=args.transit_speed)
     
     if args.preview:
         try:
             import matplotlib.pyplot as plt
             plt.figure(figsize=(6, 6))
-            # Plot X vs Y
-            plt.plot(signal[:, 0], signal[:, 1], lw=0.5)
+            # Plot X vs Y, thinned to ~10k points (long show signals have millions;
+            # a strided view looks the same at this size and renders far faster)
+            stride = max(1, len(signal) // 10000)
+            plt.plot(signal[::stride, 0], signal[::stride, 1], lw=0.5)
             # Set limits just outside [-1, 1]
             plt.xlim(-1.1, 1.1)
             plt.ylim(-1.1, 1.1)
@@ -111,10 +127,10 @@ def main():
         
         if os.path.isdir(args.input_file):
              # Save directly, do not repeat
-             write(args.output, args.sample_rate, signal)
+             write_wav(args.output, signal, sample_rate=args.sample_rate, wav_format=args.wav_format)
              print(f"Saved show to {args.output}")
         else:
-             save_wav(signal, args.output, sample_rate=args.sample_rate, duration=args.duration)
+             save_wav(signal, args.output, sample_rate=args.sample_rate, duration=args.duration, wav_format=args.wav_format)
 
     if args.play:
         stream_audio(signal, sample_rate=args.sample_rate)
@@ -1,113 +1,537 @@
 from http.server import BaseHTTPRequestHandler
 import os
-import sys
+import math
 import json
+import numpy as np
+import logging
+import io
+import gzip
+import hashlib
+import threading
 import tempfile
-import traceback
-import email
-from email.policy import default
+import shutil
+import struct
+import functools
+from collections import OrderedDict
+from xml.parsers.expat import ExpatError
+from urllib.parse import urlsplit, parse_qs
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import MultipartDecoder, Field, File, Data, Epilogue, NeedData
 
-# Add repository root to path to import oscgv
-# Since this file is in /web/api/index.py, and oscgv is in /web/oscgv/, the repo root is ../
-repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
-if repo_root not in sys.path:
-    sys.path.append(repo_root)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Numba (if installed) caches compiled kernels next to the source by default, which
+# is read-only on serverless; /tmp survives between warm invocations
+os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'numba'))
+
+logger = logging.getLogger(__name__)
 
 try:
-    from oscgv.parser import parse_svg
-    from oscgv.audio import generate_signal
+    from oscgv.parser import parse_svg, pack_paths
+    from oscgv.audio import generate_signal, to_int16
 except ImportError as e:
-    print(f"Import error: {e}")
+    logger.error("Import error: %s", e)
     parse_svg = None
     generate_signal = None
 
+# Uploads are read and decoded in chunks of this size instead of all at once
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Request limits: bodies are rejected before anything is read or allocated
+MAX_UPLOAD_BYTES = 8 * 1024 * 1024
+MAX_UPLOAD_PARTS = 32
+
+# Render parameter limits. Frames are 48000 / refresh_rate samples, so this keeps
+# them between 1 sample and one second of audio
+MIN_REFRESH_RATE = 1.0
+MAX_REFRESH_RATE = 48000.0
+
+# Parsed paths of recently uploaded SVGs (clients resend the same file when only
+# the parameters change), keyed by a hash of the file's bytes, least recent first
+PATH_CACHE_SIZE = 256
+_PATH_CACHE = OrderedDict()
+_PATH_CACHE_LOCK = threading.Lock()
+
+def _cached_parse(svg_bytes):
+    """
+    Returns parse_svg() of an in-memory SVG, memoized by a hash of its bytes.
+    """
+    key = hashlib.blake2b(svg_bytes, digest_size=16).digest()
+    with _PATH_CACHE_LOCK:
+        paths = _PATH_CACHE.get(key)
+        if paths is not None:
+            _PATH_CACHE.move_to_end(key)
+            return paths
+    
+    # Parse outside the lock so other requests aren't held up
+    paths = parse_svg(io.BytesIO(svg_bytes))
+    with _PATH_CACHE_LOCK:
+        _PATH_CACHE[key] = paths
+        if len(_PATH_CACHE) > PATH_CACHE_SIZE:
+            _PATH_CACHE.popitem(last=False)
+    return paths
+
+# Rendered frames are also kept on disk, shared by worker processes and restarts.
+# The directory is trimmed back to FRAME_CACHE_MAX_BYTES every few stores.
+FRAME_CACHE_DIR = os.environ.get('OSCGV_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'oscgv-cache'))
+FRAME_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FRAME_CACHE_SWEEP_EVERY = 64
+_frame_stores = 0
+
+# Cached frames outlive restarts and deploys, so their key also covers the renderer:
+# FRAME_CACHE_VERSION (bump it when the stored format changes) and a hash of the oscgv
+# sources, so frames rendered by older parse_svg/generate_signal code are never served
+FRAME_CACHE_VERSION = 1
+
+def _renderer_fingerprint():
+    """
+    Returns a digest of FRAME_CACHE_VERSION and the source files of the oscgv renderer.
+    """
+    key = hashlib.blake2b(struct.pack('<I', FRAME_CACHE_VERSION), digest_size=16)
+    for func in (parse_svg, generate_signal):
+        try:
+            with open(func.__code__.co_filename, 'rb') as f:
+                key.update(f.read())
+        except (AttributeError, OSError):
+            pass
+    return key.digest()
+
+_RENDERER_FINGERPRINT = _renderer_fingerprint()
+
+# Response headers describing the raw PCM bodies (float32 and, on request, int16)
+PCM_HEADERS = {
+    'X-Sample-Rate': '48000',
+    'X-Channels': '2',
+    'X-Sample-Format': 'float32le',
+}
+PCM16_HEADERS = dict(PCM_HEADERS, **{'X-Sample-Format': 'int16le'})
+
+def _frame_cache_path(svg_bytes, refresh_rate, transit_speed):
+    """
+    Returns the disk cache file of a rendered frame, named by a hash of the renderer
+    version, the SVG bytes and every render parameter (refresh rate, transit speed,
+    sample rate).
+    """
+    key = hashlib.blake2b(_RENDERER_FINGERPRINT, digest_size=16)
+    key.update(svg_bytes)
+    key.update(struct.pack('<ddI', refresh_rate, transit_speed, 48000))
+    return os.path.join(FRAME_CACHE_DIR, key.hexdigest() + '.f32')
+
+def _open_cached_frame(cache_path):
+    """
+    Opens a cached frame for reading, or returns None on a miss. A hit refreshes
+    the file's mtime, which the sweep uses as its LRU order.
+    """
+    try:
+        f = open(cache_path, 'rb')
+    except OSError:
+        return None
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return f
+
+def _store_frame(cache_path, body):
+    """
+    Atomically writes a rendered frame to the disk cache. Best effort: filesystem
+    errors (e.g. a read-only or full disk) only mean the frame isn't cached.
+    """
+    global _frame_stores
+    tmp_path = None
+    try:
+        os.makedirs(FRAME_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=FRAME_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+        
+    _frame_stores += 1
+    if _frame_stores % FRAME_CACHE_SWEEP_EVERY == 0:
+        _sweep_frame_cache()
+
+def _sweep_frame_cache():
+    """
+    Deletes the least recently used cached frames until the cache fits in
+    FRAME_CACHE_MAX_BYTES.
+    """
+    entries = []
+    try:
+        with os.scandir(FRAME_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.f32'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+        
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= FRAME_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+class InvalidSVG(Exception):
+    """
+    Raised when an uploaded file can't be parsed into paths (a client error).
+    """
+
+def _render_frame(svg_bytes, refresh_rate, transit_speed):
+    """
+    Renders one frame of an uploaded SVG as raw interleaved little-endian float32
+    samples (L, R, L, R, ...).
+    
+    Top-level (picklable) so it can also run in a worker process, see handler.executor.
+    
+    Raises:
+        InvalidSVG: If the file is not well-formed XML, has malformed elements (svgpathtools
+            raises KeyError/IndexError, e.g. for a <path> without d) or no drawable paths.
+    """
+    try:
+        paths = _cached_parse(svg_bytes)
+    except (ExpatError, ValueError, KeyError, IndexError) as e:
+        # Re-raised as a plain exception so it also pickles back from a worker process
+        raise InvalidSVG(str(e)) from None
+    signal = generate_signal(paths, sample_rate=48000, refresh_rate=refresh_rate, transit_speed=transit_speed)
+    return np.ascontiguousarray(signal, dtype='<f4').tobytes()
+
+@functools.lru_cache(maxsize=32)
+def _error_body(message):
+    """
+    Returns the encoded JSON body of an error response. The handful of fixed
+    messages are encoded once and then reused from the cache.
+    """
+    if orjson is not None:
+        return orjson.dumps({"error": message})
+    return json.dumps({"error": message}).encode()
+
+def _accepts_gzip(accept_encoding):
+    """
+    Returns True if an Accept-Encoding header value allows gzip (and doesn't set q=0).
+    """
+    for coding in accept_encoding.split(','):
+        name, *params = coding.split(';')
+        if name.strip().lower() != 'gzip':
+            continue
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+def _frame_json(body):
+    """
+    Serializes a rendered frame (raw float32 bytes) as the legacy JSON response
+    {"signal_left": [...], "signal_right": [...], "sample_rate": 48000}.
+    """
+    frame = np.frombuffer(body, dtype='<f4').reshape(-1, 2)
+    left = np.ascontiguousarray(frame[:, 0])
+    right = np.ascontiguousarray(frame[:, 1])
+    if orjson is not None:
+        # orjson writes the arrays directly, without building lists of Python floats
+        response_data = {"signal_left": left, "signal_right": right, "sample_rate": 48000}
+        return orjson.dumps(response_data, option=orjson.OPT_SERIALIZE_NUMPY)
+    response_data = {"signal_left": left.tolist(), "signal_right": right.tolist(), "sample_rate": 48000}
+    return json.dumps(response_data).encode()
+
 class handler(BaseHTTPRequestHandler):
+    # Optional concurrent.futures executor that frames are rendered in (the dev server
+    # uses a process pool); None renders on the request thread, as on Vercel
+    executor = None
+    
+    # Keep connections open between requests (every response sets Content-Length;
+    # responses sent before the body was fully read close the connection instead)
+    protocol_version = "HTTP/1.1"
+    
+    # Buffer wfile so the status line, headers and a typical frame body go out in one
+    # send instead of several small ones (the server flushes after every request)
+    wbufsize = 64 * 1024
+    
+    def handle_expect_100(self):
+        """
+        Sends the interim 100 Continue for Expect: 100-continue uploads. The base class
+        only writes it into the buffered wfile, so it is flushed here or the client
+        waits out its Expect timeout before sending the body.
+        """
+        result = super().handle_expect_100()
+        self.wfile.flush()
+        return result
+    
     def do_POST(self):
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
+            try:
+                content_length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                self.close_connection = True
+                self.send_error_response(400, "Invalid Content-Length")
+                return
+            if content_length < 0:
+                self.close_connection = True
+                self.send_error_response(400, "Negative Content-Length")
+                return
             if content_length == 0:
-                self.send_error_response(400, "Content-Length missing or zero")
+                # A body sent without Content-Length (e.g. chunked) is left unread,
+                # so the connection can't be reused for the next request
+                self.close_connection = True
+                if 'Content-Length' not in self.headers and 'Transfer-Encoding' in self.headers:
+                    self.send_error_response(411, "Content-Length required")
+                else:
+                    self.send_error_response(400, "Content-Length missing or zero")
+                return
+            if content_length > MAX_UPLOAD_BYTES:
+                # The body is left unread, so don't reuse the connection
+                self.close_connection = True
+                self.send_error_response(413, f"Upload too large (max {MAX_UPLOAD_BYTES} bytes)")
                 return
 
-            post_data = self.rfile.read(content_length)
+            mimetype, options = parse_options_header(self.headers.get('Content-Type', ''))
+            if mimetype != 'multipart/form-data':
+                self.close_connection = True
+                self.send_error_response(415, "Expected a multipart/form-data body")
+                return
+            boundary = options.get('boundary')
+            if not boundary:
+                self.close_connection = True
+                self.send_error_response(400, "Missing multipart boundary")
+                return
             
-            # Use email library to parse multipart/form-data
-            headers = f"Content-Type: {self.headers.get('Content-Type', '')}\n\n".encode('latin-1') 
-            msg = email.message_from_bytes(headers + post_data, policy=default)
+            try:
+                fields = self.read_multipart(boundary, content_length)
+            except ValueError:
+                self.close_connection = True
+                self.send_error_response(400, "Malformed multipart body")
+                return
+            except RequestEntityTooLarge:
+                self.close_connection = True
+                self.send_error_response(413, f"Too many form parts (max {MAX_UPLOAD_PARTS})")
+                return
             
-            file_content = None
+            file_content = fields.get('file')
             refresh_rate = 60.0
             transit_speed = 20.0
             
-            if msg.is_multipart():
-                for part in msg.iter_parts():
-                    name = part.get_param("name", header="Content-Disposition")
-                    
-                    if name == "file":
-                        file_content = part.get_payload(decode=True)
-                    elif name == "refresh_rate":
-                        try:
-                            refresh_rate = float(part.get_payload(decode=True).decode().strip())
-                        except:
-                            pass
-                    elif name == "transit_speed":
-                         try:
-                            transit_speed = float(part.get_payload(decode=True).decode().strip())
-                         except:
-                            pass
+            # float() parses the raw bytes directly and ignores surrounding whitespace
+            if 'refresh_rate' in fields:
+                try:
+                    refresh_rate = float(fields['refresh_rate'])
+                except (ValueError, TypeError):
+                    pass
+            if 'transit_speed' in fields:
+                try:
+                    transit_speed = float(fields['transit_speed'])
+                except (ValueError, TypeError):
+                    pass
+            
+            # NaN fails both comparisons, so it is rejected too
+            if not MIN_REFRESH_RATE <= refresh_rate <= MAX_REFRESH_RATE:
+                self.send_error_response(400, f"refresh_rate must be between {MIN_REFRESH_RATE:g} and {MAX_REFRESH_RATE:g} Hz")
+                return
+            if not (math.isfinite(transit_speed) and transit_speed > 0):
+                self.send_error_response(400, "transit_speed must be a positive number")
+                return
             
             if file_content is None:
                 self.send_error_response(400, "No file provided")
                 return
-
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(suffix='.svg', delete=False) as tf:
-                tf.write(file_content)
-                tf_path = tf.name
-            
-            try:
-                # Parse and Generate
-                if parse_svg is None:
-                        raise ImportError("oscgv module not found (check requirements)")
-
-                paths = parse_svg(tf_path)
-                
-                # Generate single frame
-                signal = generate_signal(paths, sample_rate=48000, refresh_rate=refresh_rate, transit_speed=transit_speed)
-                
-                # Convert to list for JSON serialization
-                left = signal[:, 0].tolist()
-                right = signal[:, 1].tolist()
                 
-                response_data = {
-                    "signal_left": left,
-                    "signal_right": right,
-                    "sample_rate": 48000
-                }
+            # Parse and Generate
+            if parse_svg is None:
+                    raise ImportError("oscgv module not found (check requirements)")
+            
+            response_format = self.response_format()
+            
+            cache_path = _frame_cache_path(file_content, refresh_rate, transit_speed)
+            cached = _open_cached_frame(cache_path)
+            if cached is not None:
+                with cached:
+                    if response_format == 'f32' and not _accepts_gzip(self.headers.get('Accept-Encoding', '')):
+                        # Cached raw frame: copy the file straight to the socket
+                        self.send_file(cached, 'application/octet-stream', PCM_HEADERS)
+                        return
+                    body = cached.read()
+            else:
+                # Generate single frame, parsed straight from the uploaded bytes. It is sent
+                # as raw float32 samples instead of JSON lists of Python floats.
+                try:
+                    if self.executor is not None:
+                        body = self.executor.submit(_render_frame, bytes(file_content), refresh_rate, transit_speed).result()
+                    else:
+                        body = _render_frame(file_content, refresh_rate, transit_speed)
+                except InvalidSVG as e:
+                    # The client's fault: log the parser's reason, but send a fixed message
+                    logger.info("Invalid SVG upload: %s", e)
+                    self.send_error_response(400, "Invalid SVG")
+                    return
+                _store_frame(cache_path, body)
                 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(response_data).encode())
+            if response_format == 'json':
+                self.send_body(_frame_json(body), 'application/json')
+            elif response_format == 'i16':
+                pcm = to_int16(np.frombuffer(body, dtype='<f4')).astype('<i2', copy=False)
+                self.send_body(pcm.tobytes(), 'application/octet-stream', PCM16_HEADERS)
+            elif response_format == 'l16':
+                # audio/L16 is big-endian by definition (RFC 2586)
+                pcm = to_int16(np.frombuffer(body, dtype='<f4')).astype('>i2')
+                self.send_body(pcm.tobytes(), 'audio/L16; rate=48000; channels=2')
+            else:
+                self.send_body(body, 'application/octet-stream', PCM_HEADERS)
                 
-            finally:
-                # Cleanup
-                if os.path.exists(tf_path):
-                    os.remove(tf_path)
+        except ConnectionError:
+            # Client went away mid-request; nothing left to answer
+            self.close_connection = True
+        except Exception:
+            # Details go to the server log only, not to the client
+            logger.exception("Render failed")
+            self.close_connection = True
+            self.send_error_response(500, "Internal server error")
+
+    def response_format(self):
+        """
+        Picks the frame encoding for this request.
+        
+        Returns:
+            str: 'json' (legacy JSON lists, for Accept: application/json), 'i16'
+            (little-endian int16, for ?fmt=i16), 'l16' (Accept: audio/L16) or
+            'f32' (little-endian float32, the default).
+        """
+        accept = self.headers.get('Accept', '').lower()
+        if 'application/json' in accept and 'application/octet-stream' not in accept:
+            return 'json'
+        if parse_qs(urlsplit(self.path).query).get('fmt') == ['i16']:
+            return 'i16'
+        if 'audio/l16' in accept:
+            return 'l16'
+        return 'f32'
+
+    def send_body(self, body, content_type, headers=None):
+        """
+        Sends a 200 response, gzipped when the client accepts it.
+        """
+        # Stroke waveforms compress somewhat; level 1 keeps compression cheap
+        gzipped = _accepts_gzip(self.headers.get('Accept-Encoding', ''))
+        if gzipped:
+            body = gzip.compress(body, compresslevel=1)
+            
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding, Accept')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_file(self, f, content_type, headers=None):
+        """
+        Sends a 200 response whose body is an open binary file (from its current
+        position), unencoded.
+        """
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Vary', 'Accept-Encoding, Accept')
+        self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size - f.tell()))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.flush()
+        try:
+            # Zero-copy: the kernel moves the file to the socket (os.sendfile where available)
+            self.connection.sendfile(f, f.tell())
+        except (AttributeError, ValueError):
+            # Not a socket, or a socket/file sendfile refuses (io.UnsupportedOperation
+            # is a ValueError) before anything was sent. Socket errors such as a
+            # client that went away propagate instead of being retried.
+            shutil.copyfileobj(f, self.wfile, UPLOAD_CHUNK_SIZE)
+
+    def read_multipart(self, boundary, content_length):
+        """
+        Streams a multipart/form-data body from rfile through werkzeug's decoder.
+        
+        Parts are accumulated chunk by chunk (the body size is capped by
+        MAX_UPLOAD_BYTES); only the first part of each name is kept.
+        
+        Returns:
+            dict: Field names mapped to their raw bytes (bytearray).
+            
+        Raises:
+            ValueError: If the body is not valid multipart data.
+            RequestEntityTooLarge: If the body has more than MAX_UPLOAD_PARTS parts.
+        """
+        decoder = MultipartDecoder(boundary.encode('latin-1'), max_parts=MAX_UPLOAD_PARTS)
+        fields = {}
+        sink = None
+        remaining = content_length
+        
+        # One scratch buffer is reused for every read (the decoder copies out of it)
+        view = memoryview(bytearray(UPLOAD_CHUNK_SIZE))
+        
+        while True:
+            n = self.rfile.readinto(view[:min(UPLOAD_CHUNK_SIZE, remaining)]) if remaining > 0 else 0
+            remaining -= n
+            # An empty read ends the body; None tells the decoder it is complete
+            decoder.receive_data(view[:n] if n else None)
+            
+            event = decoder.next_event()
+            while not isinstance(event, (Epilogue, NeedData)):
+                if isinstance(event, (Field, File)):
+                    if event.name in fields:
+                        sink = None
+                    else:
+                        fields[event.name] = bytearray()
+                        sink = fields[event.name].extend
+                elif isinstance(event, Data):
+                    if sink is not None:
+                        sink(event.data)
+                event = decoder.next_event()
                 
-        except Exception as e:
-            traceback.print_exc()
-            self.send_error_response(500, str(e))
+            if not n:
+                return fields
 
     def send_error_response(self, code, message):
+        body = _error_body(message)
         self.send_response(code)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            # Tell keep-alive clients not to send another request on this connection
+            self.send_header('Connection', 'close')
         self.end_headers()
-        response = {"error": message}
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(body)
 
     def do_GET(self):
+         body = "OsCvg API is running".encode()
          self.send_response(200)
          self.send_header('Content-type', 'text/plain')
+         self.send_header('Content-Length', str(len(body)))
          self.end_headers()
-         self.wfile.write("OsCvg API is running".encode())
+         self.wfile.write(body)
+
+# Render a tiny two-path frame at import so the JIT compile (or cache load) of the
+# signal kernels happens at cold start instead of during the first request
+if generate_signal is not None:
+    try:
+        _warmup_paths = pack_paths([np.array([[0, 0], [1, 1]]), np.array([[1, 0], [0, 1]])])
+        generate_signal(_warmup_paths, sample_rate=48000, refresh_rate=60.0, transit_speed=20.0)
+    except Exception:
+        logger.exception("Warmup failed")
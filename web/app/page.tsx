@@ -5,8 +5,8 @@ import { useState, useRef, useEffect, useCallback } from "react";
 interface ProcessedSignal {
   id: string;
   name: string;
-  left: number[];
-  right: number[];
+  left: Float32Array;
+  right: Float32Array;
 }
 
 interface AssetFile {
@@ -16,6 +16,22 @@ interface AssetFile {
 
 type Tab = 'single' | 'show';
 
+// Frames are requested as interleaved little-endian int16 samples (L, R, L, R, ...),
+// half the size of float32 and plenty for preview and playback
+const SIGNAL_URL = "/api?fmt=i16";
+
+const decodeSignal = (buf: ArrayBuffer) => {
+  const interleaved = new Int16Array(buf);
+  const len = interleaved.length / 2;
+  const left = new Float32Array(len);
+  const right = new Float32Array(len);
+  for (let i = 0; i < len; i++) {
+    left[i] = interleaved[2 * i] / 32767;
+    right[i] = interleaved[2 * i + 1] / 32767;
+  }
+  return { left, right };
+};
+
 const EditableValue = ({
   value,
   onChange,
@@ -180,16 +196,15 @@ export default function Home() {
     formData.append("transit_speed", transitSpeed.toString());
 
     try {
-      const res = await fetch("/api", { method: "POST", body: formData });
+      const res = await fetch(SIGNAL_URL, { method: "POST", body: formData });
       if (!res.ok) throw new Error("Conversion failed");
-      const data = await res.json();
-      if (data.error) throw new Error(data.error);
+      const { left, right } = decodeSignal(await res.arrayBuffer());
 
       setSingleSignal({
         id: 'single',
         name: singleFile.name,
-        left: data.signal_left,
-        right: data.signal_right,
+        left,
+        right,
       });
       setCurrentTime(0);
       currentTimeRef.current = 0;
@@ -214,14 +229,14 @@ export default function Home() {
       formData.append("transit_speed", transitSpeed.toString());
 
       try {
-        const res = await fetch("/api", { method: "POST", body: formData });
+        const res = await fetch(SIGNAL_URL, { method: "POST", body: formData });
         if (!res.ok) throw new Error(`Failed: ${asset.file.name}`);
-        const data = await res.json();
+        const { left, right } = decodeSignal(await res.arrayBuffer());
         newPlaylist.push({
           id: asset.id,
           name: asset.file.name,
-          left: data.signal_left,
-          right: data.signal_right,
+          left,
+          right,
         });
       } catch (err) {
         console.error(err);
@@ -1,19 +1,20 @@
-from http.server import HTTPServer
-import sys
+from http.server import ThreadingHTTPServer
+from concurrent.futures import ProcessPoolExecutor
 import os
 
-# Add root to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from api.index import handler
 
 class RequestHandler(handler):
+    # Drop idle keep-alive connections so they don't hold a server thread forever
+    timeout = 60
+    
     def do_OPTIONS(self):
         # Handle CORS for local dev
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
     def end_headers(self):
@@ -25,5 +26,8 @@ PORT = 5328
 
 if __name__ == "__main__":
     print(f"Starting Local API Server on http://localhost:{PORT}")
-    httpd = HTTPServer(('0.0.0.0', PORT), RequestHandler)
+    # Requests are served on threads; the CPU-heavy parse + render runs in worker
+    # processes so several uploads render in parallel
+    RequestHandler.executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    httpd = ThreadingHTTPServer(('0.0.0.0', PORT), RequestHandler)
     httpd.serve_forever()
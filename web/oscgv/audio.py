@@ -3,67 +3,273 @@ try:
     import sounddevice as sd
 except ImportError:
     sd = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import PatternMatchingEventHandler
+except ImportError:
+    Observer = None
 from scipy.io.wavfile import write
 import time
 import os
+import glob
+import queue
+import threading
+import functools
+from dataclasses import dataclass
+
+# Live streaming: ring buffer length in seconds and frames per audio callback
+RING_SECONDS = 0.1
+STREAM_BLOCKSIZE = 256
+
+# Unit sample grids (np.linspace(0, 1, n)) are cached per length, up to GRID_CACHE_SIZE
+# lengths of at most GRID_CACHE_MAX_LENGTH samples (so at most ~16 MB in total);
+# longer grids are rare and just rebuilt
+GRID_CACHE_SIZE = 256
+GRID_CACHE_MAX_LENGTH = 8192
+
+@functools.lru_cache(maxsize=GRID_CACHE_SIZE)
+def _cached_unit_grid(length):
+    grid = np.linspace(0, 1, length)
+    grid.flags.writeable = False
+    return grid
+
+def _unit_grid(length):
+    """
+    Returns a read-only np.linspace(0, 1, length), reusing cached grids.
+    """
+    if length > GRID_CACHE_MAX_LENGTH:
+        return np.linspace(0, 1, length)
+    return _cached_unit_grid(length)
 
 def interpolate_path(path_points, target_length):
     """
     Interpolates a path (N, 2) to a target length (M, 2).
     """
     if target_length <= 0:
-        return np.empty((0, 2))
+        return np.empty((0, 2), dtype=np.float32)
+
+    path_points = np.asarray(path_points)
+    out = np.empty((target_length, 2), dtype=np.result_type(path_points.dtype, np.float32))
+    return interpolate_path_into(path_points, out)
+
+def interpolate_path_into(path_points, out):
+    """
+    Interpolates a path (N, 2) into a preallocated (M, 2) array (or slice of one).
     
+    Returns:
+        np.ndarray: out.
+    """
+    target_length = len(out)
+    if target_length == 0:
+        return out
+
     current_length = len(path_points)
     if current_length == 0:
-        return np.zeros((target_length, 2))
+        out[:] = 0
+        return out
     if current_length == 1:
-        return np.tile(path_points, (target_length, 1))
-        
-    # Create input indices (0 to 1)
-    input_indices = np.linspace(0, 1, current_length)
-    # Create target indices
-    target_indices = np.linspace(0, 1, target_length)
+        out[:] = path_points[0]
+        return out
+
+    # Input points sit on a uniform grid over [0, 1], so the segment each
+    # target sample falls in is just floor(t * (N - 1)). X and Y share the
+    # same indices and weights and are interpolated in one pass.
+    pos = _unit_grid(target_length) * (current_length - 1)
+    idx = pos.astype(np.intp)
+    np.minimum(idx, current_length - 2, out=idx)
+    # Positions stay float64 so indices are exact; the blend itself runs in out's dtype
+    weight = (pos - idx).astype(out.dtype, copy=False)
+
+    start = path_points[idx]
+    np.take(path_points, idx + 1, axis=0, out=out)
+    out -= start
+    out *= weight[:, None]
+    out += start
+    return out
+
+def _running_length(points):
+    """
+    Returns the cumulative distance from points[0] to each point of the buffer.
+    """
+    cum = np.zeros(len(points))
+    if len(points) > 1:
+        seg = np.hypot(points[1:, 0] - points[:-1, 0], points[1:, 1] - points[:-1, 1])
+        np.cumsum(seg, dtype=np.float64, out=cum[1:])
+    return cum
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _path_lengths(points, offsets):
+        """
+        Returns the length of each path in (points, offsets) in a single pass.
+        """
+        num_paths = len(offsets) - 1
+        lengths = np.zeros(num_paths)
+        for i in range(num_paths):
+            s = 0.0
+            for j in range(offsets[i] + 1, offsets[i + 1]):
+                dx = points[j, 0] - points[j - 1, 0]
+                dy = points[j, 1] - points[j - 1, 1]
+                s += np.sqrt(dx * dx + dy * dy)
+            lengths[i] = s
+        return lengths
+
+    @njit(cache=True, fastmath=True)
+    def _write_interp(points, start, stop, out, pos, n):
+        """
+        Linearly resamples points[start:stop] into out[pos:pos + n].
+        """
+        m = stop - start
+        step = (m - 1) / (n - 1) if n > 1 else 0.0
+        for k in range(n):
+            p = k * step
+            j = int(p)
+            if j > m - 2:
+                j = max(m - 2, 0)
+            w = np.float32(p - j)
+            a = start + j
+            b = a + 1 if m > 1 else a
+            out[pos + k, 0] = points[a, 0] + w * (points[b, 0] - points[a, 0])
+            out[pos + k, 1] = points[a, 1] + w * (points[b, 1] - points[a, 1])
+
+    @njit(cache=True, fastmath=True)
+    def _write_line(points, a, b, out, pos, n):
+        """
+        Writes n samples of the straight line points[a] -> points[b] into out[pos:pos + n].
+        """
+        step = 1.0 / (n - 1) if n > 1 else 0.0
+        for k in range(n):
+            w = np.float32(k * step)
+            out[pos + k, 0] = points[a, 0] + w * (points[b, 0] - points[a, 0])
+            out[pos + k, 1] = points[a, 1] + w * (points[b, 1] - points[a, 1])
+
+    @njit(cache=True, fastmath=True)
+    def _fill_frame(points, offsets, counts, out):
+        """
+        Writes every path followed by its transit to the next path into out.
+
+        counts[2*i] is the sample count for path i, counts[2*i + 1] the count
+        for the transit from its end to the start of path i + 1 (wrapping).
+        """
+        num_paths = len(offsets) - 1
+        pos = 0
+        for i in range(num_paths):
+            n = counts[2 * i]
+            if n > 0:
+                _write_interp(points, offsets[i], offsets[i + 1], out, pos, n)
+                pos += n
+            n = counts[2 * i + 1]
+            if n > 0:
+                _write_line(points, offsets[i + 1] - 1, offsets[(i + 1) % num_paths], out, pos, n)
+                pos += n
+else:
+    def _path_lengths(points, offsets):
+        """
+        Returns the length of each path in (points, offsets).
+        """
+        # Running length along the whole buffer; the jumps between paths cancel out
+        # in the end-minus-start difference of each path.
+        cum = _running_length(points)
+        return cum[offsets[1:] - 1] - cum[offsets[:-1]]
+
+    def _fill_frame(points, offsets, counts, out):
+        """
+        NumPy fallback of the Numba kernel above, used when numba is not installed.
+        """
+        num_paths = len(offsets) - 1
+        pos = 0
+        for i in range(num_paths):
+            n = counts[2 * i]
+            if n > 0:
+                interpolate_path_into(points[offsets[i]:offsets[i + 1]], out[pos:pos + n])
+                pos += n
+            n = counts[2 * i + 1]
+            if n > 0:
+                transit = points[[offsets[i + 1] - 1, offsets[(i + 1) % num_paths]]]
+                interpolate_path_into(transit, out[pos:pos + n])
+                pos += n
+
+def _allocate_samples(weights, minimums, total):
+    """
+    Splits total samples between entries in proportion to weights.
     
-    # Interpolate X and Y separately
-    x = np.interp(target_indices, input_indices, path_points[:, 0])
-    y = np.interp(target_indices, input_indices, path_points[:, 1])
+    Every entry gets at least its minimum: entries whose share falls below it are
+    pinned there and the rest of the budget is shared among the others. Shares are
+    rounded with the largest-remainder method, so the counts sum exactly to total
+    (unless the minimums alone exceed it, in which case the minimums are returned).
     
-    return np.stack((x, y), axis=1)
+    Args:
+        weights (np.ndarray): Non-negative weight of each entry.
+        minimums (np.ndarray): Minimum sample count of each entry.
+        total (int): Number of samples to split.
+        
+    Returns:
+        np.ndarray: Integer sample count of each entry.
+    """
+    pinned = np.zeros(len(weights), dtype=bool)
+    while True:
+        budget = total - minimums[pinned].sum()
+        free_weight = weights[~pinned].sum()
+        if budget <= 0 or free_weight <= 0:
+            return minimums.copy()
+            
+        raw = np.where(pinned, 0.0, weights * (budget / free_weight))
+        below = ~pinned & (raw < minimums)
+        if not below.any():
+            break
+        pinned |= below
+        
+    counts = np.where(pinned, minimums, np.floor(raw).astype(np.int64))
+    
+    # Hand the samples lost to rounding to the largest remainders
+    deficit = total - int(counts.sum())
+    if deficit > 0:
+        remainders = np.where(pinned, -1.0, raw - counts)
+        counts[np.argsort(-remainders, kind='stable')[:deficit]] += 1
+        
+    return counts
 
-def generate_signal(paths, sample_rate=48000, refresh_rate=60, transit_speed=20.0):
+def generate_signal(paths, sample_rate=48000, refresh_rate=60, transit_speed=20.0, path_lengths=None,
+                    transit_lengths=None):
     """
-    Generates a stereo audio signal from a list of paths, including transit lines to reduce ringing.
+    Generates a stereo audio signal from a set of paths, including transit lines to reduce ringing.
     
     Args:
-        paths (list of np.ndarray): List of paths from the parser.
+        paths (tuple): (points, offsets) from the parser; path i is points[offsets[i]:offsets[i + 1]].
         sample_rate (int): Audio sample rate in Hz.
         refresh_rate (float): Refresh rate in Hz (times to draw image per second).
         transit_speed (float): Speed factor for transit moves relative to drawing speed.
+        path_lengths (array-like, optional): Precomputed geometric length of each path.
+        transit_lengths (array-like, optional): Precomputed distance from the end of each
+            path to the start of the next one (the last entry loops back to the first path).
         
     Returns:
-        np.ndarray: Stereo audio signal (N, 2).
+        np.ndarray: Stereo audio signal (N, 2), float32.
     """
     samples_per_frame = int(sample_rate / refresh_rate)
     
+    # Points are float32 from the parser on; this only copies for foreign input
+    points, offsets = paths
+    points = np.ascontiguousarray(points, dtype=np.float32)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    
+    num_paths = len(offsets) - 1
+    if num_paths == 0:
+        return np.zeros((samples_per_frame, 2), dtype=np.float32)
+
     # Calculate geometric lengths of paths
-    path_lengths = []
-    for path in paths:
-        diffs = np.diff(path, axis=0)
-        dist = np.sum(np.sqrt(np.sum(diffs**2, axis=1)))
-        path_lengths.append(dist)
-        
+    if path_lengths is None:
+        path_lengths = _path_lengths(points, offsets)
+
     # Calculate transit lengths (end of i to start of i+1, and loop back)
-    transit_lengths = []
-    num_paths = len(paths)
-    if num_paths > 0:
-        for i in range(num_paths):
-            end_point = paths[i][-1]
-            next_start_point = paths[(i + 1) % num_paths][0]
-            dist = np.linalg.norm(next_start_point - end_point)
-            transit_lengths.append(dist)
-    else:
-        return np.zeros((samples_per_frame, 2))
+    if transit_lengths is None:
+        ends = points[offsets[1:] - 1]
+        next_starts = np.roll(points[offsets[:-1]], -1, axis=0)
+        transit_lengths = np.hypot(next_starts[:, 0] - ends[:, 0], next_starts[:, 1] - ends[:, 1])
         
     total_path_length = sum(path_lengths)
     total_transit_length = sum(transit_lengths)
@@ -94,55 +300,39 @@ def generate_signal(paths, sample_rate=48000, refresh_rate=60, transit_speed=20.
     effective_total_length = total_path_length + (total_transit_length / speed_factor)
     
     if effective_total_length == 0:
-        return np.zeros((samples_per_frame, 2))
+        return np.zeros((samples_per_frame, 2), dtype=np.float32)
         
-    signal_parts = []
-    current_sample_count = 0
-    
-    for i in range(num_paths):
-        # 1. Draw the path
-        # allocation based on PROPORTION of effective length
-        # path len is normal (factor 1)
-        path_samples = int((path_lengths[i] / effective_total_length) * samples_per_frame)
-        # Ensure at least 1 sample if length > 0
-        if path_lengths[i] > 0 and path_samples < 2: 
-            path_samples = 2
-            
-        if path_samples > 0:
-            signal_parts.append(interpolate_path(paths[i], path_samples))
-            current_sample_count += path_samples
-            
-        # 2. Draw the transit to next path
-        transit_len = transit_lengths[i]
-        if transit_len > 0:
-            # Transit gets less time (higher speed)
-            trans_samples = int(((transit_len / speed_factor) / effective_total_length) * samples_per_frame)
-            
-            # CRITICAL: Minimum samples to avoid ringing.
-            # 5-10 samples at 48kHz is very short (0.1ms) but enough to smooth the step.
-            if trans_samples < 8: 
-                trans_samples = 8
-            
-            # Start of transit is end of current path
-            # End of transit is start of next path
-            start_pt = paths[i][-1]
-            end_pt = paths[(i + 1) % num_paths][0]
-            
-            # Create a simple line
-            transit_path = np.array([start_pt, end_pt])
-            signal_parts.append(interpolate_path(transit_path, trans_samples))
-            current_sample_count += trans_samples
+    # Allocation is based on PROPORTION of effective length:
+    # path len is normal (factor 1), transits get less time (higher speed).
+    # Weights and sample counts are interleaved per path: [p0, t0, p1, t1, ...]
+    path_lengths = np.asarray(path_lengths, dtype=float)
+    transit_lengths = np.asarray(transit_lengths, dtype=float)
+    weights = np.empty(2 * num_paths)
+    weights[0::2] = path_lengths
+    weights[1::2] = transit_lengths / speed_factor
+    
+    # Ensure at least 2 samples for any path with length > 0.
+    # CRITICAL: Minimum samples for transits to avoid ringing.
+    # 5-10 samples at 48kHz is very short (0.1ms) but enough to smooth the step.
+    minimums = np.zeros(2 * num_paths, dtype=np.int64)
+    minimums[0::2] = np.where(path_lengths > 0, 2, 0)
+    minimums[1::2] = np.where(transit_lengths > 0, 8, 0)
+    
+    counts = _allocate_samples(weights, minimums, samples_per_frame)
 
-    if not signal_parts:
-        return np.zeros((samples_per_frame, 2))
+    total_samples = int(counts.sum())
+    if total_samples == 0:
+        return np.zeros((samples_per_frame, 2), dtype=np.float32)
 
-    full_signal = np.concatenate(signal_parts)
+    full_signal = np.empty((total_samples, 2), dtype=np.float32)
+    _fill_frame(points, offsets, counts, full_signal)
     
-    # Resample to match exact samples_per_frame if we drifted
+    # Counts sum exactly to samples_per_frame unless the minimums alone
+    # overflow the frame (very many paths); only then resample to fit.
     if len(full_signal) != samples_per_frame:
          full_signal = interpolate_path(full_signal, samples_per_frame)
          
-    return full_signal.astype(np.float32)
+    return full_signal
 
 def stream_audio(signal, sample_rate=48000):
     """
@@ -170,9 +360,101 @@ def stream_audio(signal, sample_rate=48000):
         stream.stop()
         stream.close()
 
+class _RingBuffer:
+    """
+    Single-producer, single-consumer ring of stereo float32 samples.
+    
+    The audio driver drains it through callback() (pass it to sd.OutputStream),
+    while the producer blocks in write() until there is room, which paces it the
+    way a blocking stream.write() would. Positions are plain ints: the producer
+    only advances the write position and the callback only the read position.
+    """
+    def __init__(self, capacity):
+        self._buf = np.zeros((capacity, 2), dtype=np.float32)
+        self._capacity = capacity
+        self._read_pos = 0
+        self._write_pos = 0
+        self._space = threading.Event()
+
+    def write(self, data):
+        """
+        Copies data (N, 2) into the ring, blocking while it is full.
+        """
+        cap = self._capacity
+        pos = 0
+        while pos < len(data):
+            free = cap - (self._write_pos - self._read_pos)
+            if free == 0:
+                self._space.clear()
+                # Re-check after clearing so a wake-up between the two is not lost
+                if cap - (self._write_pos - self._read_pos) == 0:
+                    self._space.wait(0.1)
+                continue
+
+            n = min(free, len(data) - pos)
+            start = self._write_pos % cap
+            first = min(n, cap - start)
+            self._buf[start:start + first] = data[pos:pos + first]
+            self._buf[:n - first] = data[pos + first:pos + n]
+            self._write_pos += n
+            pos += n
+
+    def callback(self, outdata, frames, time, status):
+        cap = self._capacity
+        n = min(frames, self._write_pos - self._read_pos)
+        start = self._read_pos % cap
+        first = min(n, cap - start)
+        outdata[:first] = self._buf[start:start + first]
+        outdata[first:n] = self._buf[:n - first]
+        # Underrun: pad with silence (beam at center) rather than stale samples
+        outdata[n:] = 0
+        self._read_pos += n
+        self._space.set()
+
+def _watch_files(directory, patterns):
+    """
+    Watches directory for changes to files matching patterns.
+    
+    Returns:
+        tuple: (observer, events) where events is a queue.Queue receiving the absolute
+        path of every created, modified, moved or deleted file, or (None, None) if
+        watchdog is not installed (callers fall back to polling).
+    """
+    if Observer is None:
+        return None, None
+
+    events = queue.Queue()
+
+    class _Handler(PatternMatchingEventHandler):
+        def on_any_event(self, event):
+            if event.event_type not in ('created', 'modified', 'moved', 'deleted'):
+                return
+            events.put(os.path.abspath(event.src_path))
+            if event.event_type == 'moved':
+                events.put(os.path.abspath(event.dest_path))
+
+    observer = Observer()
+    observer.schedule(_Handler(patterns=patterns, ignore_directories=True), directory, recursive=False)
+    observer.start()
+    return observer, events
+
+def _drain_events(events):
+    """
+    Returns the set of paths queued by the watcher since the last call.
+    """
+    changed = set()
+    while True:
+        try:
+            changed.add(events.get_nowait())
+        except queue.Empty:
+            return changed
+
 def stream_audio_live(file_path, sample_rate=48000, refresh_rate=60, transit_speed=20.0):
     """
-    Streams audio and polls the file for changes.
+    Streams audio and reloads the file when it changes.
+    
+    File changes are picked up from filesystem events when watchdog is installed,
+    otherwise the file's mtime is polled.
     """
     from oscgv.parser import parse_svg
     
@@ -188,58 +470,60 @@ def stream_audio_live(file_path, sample_rate=48000, refresh_rate=60, transit_spe
         print(f"Initial load failed: {e}")
         return
 
-    # Use a simpler non-blocking stream approach with a callback or just careful loop
-    # Ideally we'd use a callback to be glitch-free, but polling logic is easier in main loop.
-    # Let's use a mutable container for the signal so the callback can read it.
-    
+    # Mutable container so a reload swaps the signal the main loop queues next.
     signal_container = [current_signal]
-    
-    def callback(outdata, frames, time, status):
-        # We need to write 'frames' frames.
-        # We cycle through signal_container[0]
-        if status:
-            print(status)
-            
-        sig = signal_container[0]
-        sig_len = len(sig)
-        
-        # This simple cyclical reading is tricky with arbitrary buffer sizes without tracking phase.
-        # But `outdata` is usually small.
-        # To keep it simple, let's just use the `stream.write` blocking method in the main loop
-        # and check for file changes occasionally.
-        pass
 
-    # Clean approach: Main loop writes chunks. Check file every X seconds.
+    # Callback-mode stream: the audio driver pulls samples from a ring buffer at
+    # hardware rate while the main loop fills it and checks for file changes.
     if sd is None:
         raise ImportError("sounddevice is not installed. Audio playback is not available.")
     
-    stream = sd.OutputStream(samplerate=sample_rate, channels=2)
+    ring = _RingBuffer(int(sample_rate * RING_SECONDS))
+    stream = sd.OutputStream(samplerate=sample_rate, channels=2, callback=ring.callback, blocksize=STREAM_BLOCKSIZE)
     stream.start()
     
-    last_check = time.time()
-    check_interval = 0.5 # check every 500ms
+    watched_path = os.path.abspath(file_path)
+    # Escaped so names with glob characters (e.g. 'x[1].svg') match only themselves
+    observer, events = _watch_files(os.path.dirname(watched_path), [glob.escape(os.path.basename(watched_path))])
+    
+    # Polling fallback: check every ~500ms, counted in queued frames instead of
+    # reading the clock after every write
+    check_interval = 0.5
+    frame_dur = len(current_signal) / sample_rate
+    check_every = max(1, int(check_interval / frame_dur))
+    frames_since_check = 0
     
     try:
         while True:
-            # Write one frame (approx 1/60th sec)
-            stream.write(signal_container[0])
+            # Queue one frame (approx 1/60th sec), blocking while the ring is full
+            ring.write(signal_container[0])
             
             # Check for update
-            now = time.time()
-            if now - last_check > check_interval:
-                last_check = now
+            if events is not None:
+                # Only touch the filesystem when the watcher reported a change
+                changed = watched_path in _drain_events(events)
+            else:
+                changed = False
+                frames_since_check += 1
+                if frames_since_check >= check_every:
+                    frames_since_check = 0
+                    try:
+                        changed = os.path.getmtime(file_path) > last_mtime
+                    except OSError:
+                        pass # File is missing (e.g. mid-save)
+                
+            if changed:
                 try:
                     if os.path.exists(file_path):
                         mtime = os.path.getmtime(file_path)
-                        if mtime > last_mtime:
-                            print(f"\nReloading {file_path}...")
-                            new_paths = parse_svg(file_path)
-                            new_signal = generate_signal(new_paths, sample_rate, refresh_rate, transit_speed)
-                            
-                            # Update signal atomic-ish
-                            signal_container[0] = new_signal
-                            last_mtime = mtime
-                            print("Reloaded.")
+                        print(f"\nReloading {file_path}...")
+                        new_paths = parse_svg(file_path)
+                        new_signal = generate_signal(new_paths, sample_rate, refresh_rate, transit_speed)
+                        
+                        # Update signal atomic-ish
+                        signal_container[0] = new_signal
+                        last_mtime = mtime
+                        print("Reloaded.")
                 except Exception as e:
                     print(f"Error reloading: {e}")
                     # Keep playing old signal
@@ -247,10 +531,57 @@ def stream_audio_live(file_path, sample_rate=48000, refresh_rate=60, transit_spe
     except KeyboardInterrupt:
         print("\nLive streaming stopped.")
     finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
         stream.stop()
         stream.close()
 
-def save_wav(signal, filename, sample_rate=48000, duration=5.0):
+def _tile_into(out, signal):
+    """
+    Fills out by repeating signal from its start, copying one chunk at a time
+    instead of materializing a tiled temporary.
+    """
+    if len(signal) == 0:
+        out[:] = 0
+        return
+
+    pos = 0
+    while pos < len(out):
+        n = min(len(signal), len(out) - pos)
+        out[pos:pos + n] = signal[:n]
+        pos += n
+
+def to_int16(signal):
+    """
+    Quantizes a signal in [-1, 1] to 16-bit PCM samples.
+    
+    Scaling, clipping and rounding share a single float32 scratch buffer.
+    """
+    scaled = np.multiply(signal, 32767.0, out=np.empty(np.shape(signal), dtype=np.float32))
+    np.clip(scaled, -32768, 32767, out=scaled)
+    np.rint(scaled, out=scaled)
+    return scaled.astype(np.int16)
+
+def write_wav(filename, signal, sample_rate=48000, wav_format='int16'):
+    """
+    Writes a signal to a WAV file as-is (no looping).
+    
+    Args:
+        filename (str): Output filename.
+        signal (np.ndarray): Stereo audio signal (N, 2) in [-1, 1].
+        sample_rate (int): Sample rate.
+        wav_format (str): 'int16' (16-bit PCM, half the size) or 'float32'.
+    """
+    if wav_format == 'float32':
+        write(filename, sample_rate, np.asarray(signal, dtype=np.float32))
+    elif wav_format == 'int16':
+        # Quantize once at write time
+        write(filename, sample_rate, to_int16(signal))
+    else:
+        raise ValueError(f"Unsupported WAV format: {wav_format}")
+
+def save_wav(signal, filename, sample_rate=48000, duration=5.0, wav_format='int16'):
     """
     Saves the signal to a WAV file.
     
@@ -259,97 +590,166 @@ def save_wav(signal, filename, sample_rate=48000, duration=5.0):
         filename (str): Output filename.
         sample_rate (int): Sample rate.
         duration (float): Duration in seconds.
+        wav_format (str): 'int16' or 'float32' samples.
     """
     if duration <= 0:
         raise ValueError("Duration must be positive")
         
-    num_repeats = int(duration * sample_rate / len(signal)) + 1
-    long_signal = np.tile(signal, (num_repeats, 1))
+    long_signal = np.empty((int(duration * sample_rate), 2), dtype=signal.dtype)
+    _tile_into(long_signal, signal)
     
-    # Crop to exact duration
-    long_signal = long_signal[:int(duration * sample_rate)]
-    
-    write(filename, sample_rate, long_signal)
+    write_wav(filename, long_signal, sample_rate, wav_format)
     print(f"Saved {duration}s of audio to {filename}")
 
-def slice_paths(paths, fraction):
+@dataclass
+class PathBundle:
     """
-    Returns a subset of paths representing the first 'fraction' (0.0 to 1.0) of the total length.
+    Paths in (points, offsets) form together with their precomputed arc lengths.
+
+    Attributes:
+        points (np.ndarray): All path points (M, 2), float32.
+        offsets (np.ndarray): Path i is points[offsets[i]:offsets[i + 1]].
+        arc_len (np.ndarray): Arc length from the start of its path to each point (M,).
+        lengths (np.ndarray): Total length of each path.
+        cum_totals (np.ndarray): Running total of lengths (length of paths[0..i] inclusive).
+        gap_lengths (np.ndarray): Distance from the end of path i to the start of path i + 1.
+    """
+    points: np.ndarray
+    offsets: np.ndarray
+    arc_len: np.ndarray
+    lengths: np.ndarray
+    cum_totals: np.ndarray
+    gap_lengths: np.ndarray
+
+    @classmethod
+    def from_paths(cls, paths):
+        points, offsets = paths
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        offsets = np.asarray(offsets, dtype=np.int64)
+
+        # Restart the running length at the first point of every path
+        cum = _running_length(points)
+        arc_len = cum - np.repeat(cum[offsets[:-1]], np.diff(offsets))
+        lengths = arc_len[offsets[1:] - 1] if len(offsets) > 1 else np.empty(0)
+
+        gaps = points[offsets[1:-1]] - points[offsets[1:-1] - 1]
+        gap_lengths = np.hypot(gaps[:, 0], gaps[:, 1])
+
+        return cls(points, offsets, arc_len, lengths, np.cumsum(lengths), gap_lengths)
+
+def _slice_bundle(bundle, fraction):
+    """
+    Finds the part of the paths covering the first 'fraction' of the total length.
+    
+    Returns:
+        tuple: (offsets, cut_point, lengths). The visible paths are bundle.points[:offsets[-1]]
+        split at offsets, except that a partial last path ends at cut_point (which
+        replaces point offsets[-1] - 1) when cut_point is not None. lengths holds the
+        length of each visible path.
     """
     if fraction <= 0:
-        return []
+        return bundle.offsets[:1], None, np.empty(0)
     if fraction >= 1.0:
-        return paths
-        
-    # Calculate total length
-    path_lengths = []
-    total_length = 0
-    for path in paths:
-        diffs = np.diff(path, axis=0)
-        dist = np.sum(np.sqrt(np.sum(diffs**2, axis=1)))
-        path_lengths.append(dist)
-        total_length += dist
+        return bundle.offsets, None, bundle.lengths
+
+    target_length = bundle.cum_totals[-1] * fraction if len(bundle.cum_totals) else 0.0
+
+    # Paths whose running total fits within the target are fully visible
+    num_full = int(np.searchsorted(bundle.cum_totals, target_length, side='right'))
+    offsets = bundle.offsets[:num_full + 1]
+    lengths = bundle.lengths[:num_full]
+
+    if num_full < len(bundle.lengths):
+        remaining = target_length - (bundle.cum_totals[num_full - 1] if num_full > 0 else 0.0)
+        if remaining > 0:
+            # Cut the next path exactly 'remaining' along its arc length:
+            # seg_cum[j - 1] < remaining <= seg_cum[j]
+            start = bundle.offsets[num_full]
+            seg_cum = bundle.arc_len[start:bundle.offsets[num_full + 1]]
+            j = min(int(np.searchsorted(seg_cum, remaining)), len(seg_cum) - 1)
+            t = min((remaining - seg_cum[j - 1]) / (seg_cum[j] - seg_cum[j - 1]), 1.0)
+            a, b = bundle.points[start + j - 1], bundle.points[start + j]
+            cut_point = a + t * (b - a)
+
+            offsets = np.append(offsets, start + j + 1)
+            lengths = np.append(lengths, remaining)
+            return offsets, cut_point, lengths
+
+    return offsets, None, lengths
+
+def slice_paths(paths, fraction):
+    """
+    Returns the paths representing the first 'fraction' (0.0 to 1.0) of the total length.
+
+    Args:
+        paths (tuple or PathBundle): (points, offsets) to slice. Pass a PathBundle
+            when slicing the same paths repeatedly to avoid recomputing lengths.
+        fraction (float): Fraction of the total length to keep.
         
-    target_length = total_length * fraction
-    
-    current_length = 0
-    sliced_paths = []
-    
-    for i, path in enumerate(paths):
-        p_len = path_lengths[i]
-        if current_length + p_len <= target_length:
-            # Full path included
-            sliced_paths.append(path)
-            current_length += p_len
-        else:
-            # Partial path needed
-            remaining = target_length - current_length
-            if remaining > 0 and p_len > 0:
-                # Approximate index
-                # We assume uniform distribution of points approx?
-                # path is array of points. Length is sum of segments.
-                # Simple approximation: index proportional to length fraction
-                idx = int((remaining / p_len) * len(path))
-                if idx > 1:
-                    sliced_paths.append(path[:idx])
-            break
-            
-    return sliced_paths
+    Returns:
+        tuple: (points, offsets) of the visible paths (a new points array).
+    """
+    bundle = paths if isinstance(paths, PathBundle) else PathBundle.from_paths(paths)
+    offsets, cut_point, _ = _slice_bundle(bundle, fraction)
+    points = bundle.points[:offsets[-1]].copy()
+    if cut_point is not None:
+        points[-1] = cut_point
+    return points, offsets
 
 def generate_animation(paths, duration, sample_rate=48000, refresh_rate=60, transit_speed=20.0):
     """
     Generates an animation signal that progressively reveals the paths.
     
     Args:
-        paths: List of paths.
+        paths: (points, offsets) from the parser (or a PathBundle).
         duration: functionality duration in seconds.
     """
     num_frames = int(duration * refresh_rate)
     samples_per_frame = int(sample_rate / refresh_rate)
+
+    # Arc lengths are computed once and shared by every frame
+    bundle = paths if isinstance(paths, PathBundle) else PathBundle.from_paths(paths)
     
-    full_signal = []
+    # Frames render from views into one scratch copy of the points: only the cut
+    # point of the partial path is patched in (and restored) per frame.
+    scratch = bundle.points.copy()
+    
+    # Every frame is exactly samples_per_frame long, so frames are written
+    # straight into one preallocated buffer instead of concatenated at the end.
+    full_signal = np.zeros((num_frames * samples_per_frame, 2), dtype=np.float32)
     
     for i in range(num_frames):
         progress = (i + 1) / num_frames
         # Non-linear progress for better effect? (Ease-out)
         # progress = np.sin(progress * np.pi / 2) 
         
-        visible_paths = slice_paths(paths, progress)
+        visible_offsets, cut_point, visible_lengths = _slice_bundle(bundle, progress)
+        num_visible = len(visible_offsets) - 1
         
-        if not visible_paths:
-            # Silence/Center for this frame
-            frame_sig = np.zeros((samples_per_frame, 2))
-        else:
-            # Generate one frame
-            # scale transit speed? maybe keep it constant?
-            frame_sig = generate_signal(visible_paths, sample_rate, refresh_rate, transit_speed)
+        if num_visible == 0:
+            # Silence/Center for this frame (buffer is zero-initialized)
+            continue
+            
+        end = visible_offsets[-1]
+        if cut_point is not None:
+            scratch[end - 1] = cut_point
             
-        full_signal.append(frame_sig)
+        # Every visible path but the last is complete and the last one starts where
+        # its full path does, so all transits except the closing one are fixed.
+        # Only the partial tail's length and the closing transit change per frame.
+        closing = np.hypot(*(scratch[0] - scratch[end - 1]))
+        visible_transits = np.append(bundle.gap_lengths[:num_visible - 1], closing)
+
+        # Generate one frame
+        # scale transit speed? maybe keep it constant?
+        frame_sig = generate_signal((scratch[:end], visible_offsets), sample_rate, refresh_rate, transit_speed,
+                                    path_lengths=visible_lengths, transit_lengths=visible_transits)
+        full_signal[i * samples_per_frame:(i + 1) * samples_per_frame] = frame_sig
         
-    if not full_signal:
-        return np.zeros((0, 2))
+        if cut_point is not None:
+            scratch[end - 1] = bundle.points[end - 1]
         
-    return np.concatenate(full_signal).astype(np.float32)
+    return full_signal
 
 def generate_show(signals, interval, total_duration, sample_rate=48000, animations=None):
     """
@@ -413,11 +813,7 @@ def generate_show(signals, interval, total_duration, sample_rate=48000, animatio
                 current_sample += write_len
             else:
                 # Tile signal to fill remaining slot
-                repeats = int(np.ceil(write_len / len(sig)))
-                chunk = np.tile(sig, (repeats, 1))
-                chunk = chunk[:write_len]
-                
-                show_signal[current_sample : current_sample + write_len] = chunk
+                _tile_into(show_signal[current_sample : current_sample + write_len], sig)
                 current_sample += write_len
             
         signal_idx += 1
@@ -427,8 +823,10 @@ def generate_show(signals, interval, total_duration, sample_rate=48000, animatio
 def stream_show_live(directory, interval=10.0, sample_rate=48000, refresh_rate=60, transit_speed=20.0, animate_duration=0.0):
     """
     Streams audio from a directory of SVGs, looping continuously and reloading files.
+    
+    With watchdog installed the directory is only rescanned, and files only re-stat'ed,
+    after the watcher reports a change; otherwise both are polled every cycle.
     """
-    import glob
     from oscgv.parser import parse_svg
     
     print(f"Live Show Mode: {directory}")
@@ -438,29 +836,63 @@ def stream_show_live(directory, interval=10.0, sample_rate=48000, refresh_rate=6
     if sd is None:
         raise ImportError("sounddevice is not installed. Audio playback is not available.")
 
-    stream = sd.OutputStream(samplerate=sample_rate, channels=2)
+    ring = _RingBuffer(int(sample_rate * RING_SECONDS))
+    stream = sd.OutputStream(samplerate=sample_rate, channels=2, callback=ring.callback, blocksize=STREAM_BLOCKSIZE)
     stream.start()
     
-    # Cache: path -> {'mtime': float, 'signal': np.ndarray}
+    # Cache: path -> {'mtime': float, 'paths': tuple, 'signal': np.ndarray,
+    #                 'anim_key': (mtime, animate_duration), 'animation': np.ndarray}
     signal_cache = {}
     
+    observer, events = _watch_files(directory, ['*.svg'])
+    svg_files = []
+    rescan = True
+    removed = set()
+    
     try:
         while True:
-            svg_files = sorted(glob.glob(os.path.join(directory, "*.svg")))
+            if events is None or rescan:
+                svg_files = sorted(os.path.abspath(f) for f in glob.glob(os.path.join(directory, "*.svg")))
+                rescan = False
+                removed.clear()
             if not svg_files:
                 print("No SVGs found. Waiting...")
                 time.sleep(1)
+                rescan = True
                 continue
                 
             for f in svg_files:
-                # Re-check if file exists
-                if not os.path.exists(f): 
-                    continue
+                current_mtime = None
+                if events is not None:
+                    # Mark reported files stale (mtime None never matches) and rescan
+                    # the directory on the next cycle; stat only the files that changed.
+                    for path in _drain_events(events):
+                        rescan = True
+                        if not os.path.exists(path):
+                            removed.add(path)
+                            signal_cache.pop(path, None)
+                            continue
+                        removed.discard(path)
+                        if path in signal_cache:
+                            signal_cache[path]['mtime'] = None
+                    if f in removed:
+                        continue
+                else:
+                    # One stat both re-checks that the file exists and gets its mtime
+                    try:
+                        current_mtime = os.path.getmtime(f)
+                    except OSError:
+                        continue
                     
                 print(f"Now Playing: {os.path.basename(f)}")
                 
                 try:
-                    current_mtime = os.path.getmtime(f)
+                    if current_mtime is None:
+                        cached = signal_cache.get(f)
+                        if cached is not None and cached['mtime'] is not None:
+                            current_mtime = cached['mtime']
+                        else:
+                            current_mtime = os.path.getmtime(f)
                     
                     # Check cache for STATIC signal
                     if f in signal_cache and signal_cache[f]['mtime'] == current_mtime:
@@ -477,53 +909,52 @@ def stream_show_live(directory, interval=10.0, sample_rate=48000, refresh_rate=6
                         # Parse and generate
                         paths = parse_svg(f)
                         static_signal = generate_signal(paths, sample_rate, refresh_rate, transit_speed)
-                        signal_cache[f] = {'mtime': current_mtime, 'signal': static_signal}
+                        # Keep the parsed paths so the animation can be built without re-parsing
+                        signal_cache[f] = {'mtime': current_mtime, 'paths': paths, 'signal': static_signal}
                         
                 except Exception as e:
                     print(f"Error loading {f}: {e}")
                     time.sleep(1)
                     continue
                 
-                # Setup playback for this interval
-                start_time = time.time()
+                # Playback time for this interval, counted in queued samples
+                played = 0.0
                 
                 # Animation phase
                 if animate_duration > 0:
                     try:
-                        # Don't cache animation for now (expensive memory?) or maybe we should?
-                        # Generating animation takes time (lots of frames).
-                        # Let's generate it on the fly only if needed.
-                        # For smoothness, pre-calculating is better.
-                        # Let's add it to cache.
-                        if 'animation' not in signal_cache[f]:
-                             # Need paths again... cache paths?
-                             # Or just re-parse?
-                             p = parse_svg(f)
-                             anim_sig = generate_animation(p, animate_duration, sample_rate, refresh_rate, transit_speed)
-                             signal_cache[f]['animation'] = anim_sig
+                        # Generating animation takes time (lots of frames), so it is cached
+                        # alongside the static signal, keyed by the file version and the
+                        # animation length, and built from the cached paths.
+                        entry = signal_cache[f]
+                        anim_key = (entry['mtime'], animate_duration)
+                        if entry.get('anim_key') != anim_key:
+                             entry['animation'] = generate_animation(entry['paths'], animate_duration, sample_rate, refresh_rate, transit_speed)
+                             entry['anim_key'] = anim_key
                         
-                        anim_signal = signal_cache[f]['animation']
+                        anim_signal = entry['animation']
                         
                         # Write animation once
-                        stream.write(anim_signal)
+                        ring.write(anim_signal)
                         
-                        # Adjust start time so the interval counts the animation?
                         # User said "doing a little animation ... BEFORE having it still".
                         # Usually implies Interval = Animation + Static.
-                        
-                        # If interval is 10s, animation is 2s.
-                        # We played 2s. Remaining time = 8s.
-                        # But 'stream.write' blocks. So 'time.time()' will Advance.
+                        # If interval is 10s, animation is 2s: remaining time = 8s.
+                        played = len(anim_signal) / sample_rate
                         
                     except Exception as e:
                         print(f"Animation error: {e}")
 
-                # Static phase
-                while time.time() - start_time < interval:
-                     stream.write(static_signal)
+                # Static phase: the number of frame writes is known up front
+                frame_dur = len(static_signal) / sample_rate
+                for _ in range(max(1, int(round((interval - played) / frame_dur)))):
+                     ring.write(static_signal)
                      
     except KeyboardInterrupt:
         print("\nLive show stopped.")
     finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
         stream.stop()
         stream.close()
@@ -1,42 +1,73 @@
 import numpy as np
-from svgpathtools import svg2paths
-import warnings
+from svgpathtools import svg2paths, Line, QuadraticBezier, CubicBezier
+
+# Cubic Bezier in matrix form: B(t) = [t^3, t^2, t, 1] @ _CUBIC_BASIS @ [P0, P1, P2, P3]
+_CUBIC_BASIS = np.array([[-1, 3, -3, 1],
+                         [3, -6, 3, 0],
+                         [-3, 3, 0, 0],
+                         [1, 0, 0, 0]], dtype=float)
+
+# Composite 4 x 8-point and 8 x 8-point Gauss-Legendre rules on [0, 1], used to integrate
+# the speed |B'(t)| of every Bezier segment of a path in one vectorized evaluation.
+# Segments where the two disagree by more than LENGTH_RTOL (cusps, stops mid-curve)
+# fall back to svgpathtools' adaptive length().
+def _composite_gauss_legendre(panels, order=8):
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    t = ((np.arange(panels)[:, None] + (nodes + 1) / 2) / panels).ravel()
+    return t, np.tile(weights / (2 * panels), panels)
+
+_QUAD_T, _QUAD_W = _composite_gauss_legendre(4)
+_QUAD_T_FINE, _QUAD_W_FINE = _composite_gauss_legendre(8)
+LENGTH_RTOL = 1e-6
 
 def parse_svg(file_path, points_per_unit=100):
     """
-    Parses an SVG file and converts it into a list of normalized point arrays.
+    Parses an SVG file and converts it into normalized, contiguous point data.
     
     Args:
-        file_path (str): Path to the SVG file.
+        file_path (str or file-like): Path to the SVG file, or an open binary file object.
         points_per_unit (int): Density of points per unit length.
         
     Returns:
-        list of np.ndarray: A list where each element is a (N, 2) numpy array of (x, y) coordinates.
-                           Coordinates are normalized to [-1, 1].
+        tuple: (points, offsets). points is a float32 (M, 2) array of (x, y) coordinates
+               of all paths back to back, normalized to [-1, 1]; path i is
+               points[offsets[i]:offsets[i + 1]] (offsets has one entry per path plus one).
     """
     paths, attributes = svg2paths(file_path)
     
     if not paths:
         raise ValueError("No paths found in SVG file.")
     
-    # Calculate bounding box of all paths
-    min_x, max_x, min_y, max_y = float('inf'), float('-inf'), float('inf'), float('-inf')
+    # Sample counts per path, so all points can go into one preallocated buffer
+    sampled_paths = []
     
-    # First pass: compute bounding box and total length
     for path in paths:
-        try:
-            xmin, xmax, ymin, ymax = path.bbox()
-            min_x = min(min_x, xmin)
-            max_x = max(max_x, xmax)
-            min_y = min(min_y, ymin)
-            max_y = max(max_y, ymax)
-        except Exception as e:
-            warnings.warn(f"Could not compute bbox for path: {e}")
+        coeffs = _segment_coefficients(path)
+        seg_lengths = _segment_lengths(path, coeffs)
+        length = sum(seg_lengths)
+        if length == 0:
             continue
-
-    if min_x == float('inf'):
-         raise ValueError("Could not determine bounding box of SVG.")
-
+            
+        # Determine number of points based on length
+        num_points = max(2, int(length * points_per_unit))
+        sampled_paths.append((path, coeffs, seg_lengths / length, num_points))
+        
+    if not sampled_paths:
+        raise ValueError("No drawable (non-zero-length) paths in SVG file.")
+        
+    offsets = np.zeros(len(sampled_paths) + 1, dtype=np.int64)
+    np.cumsum([entry[-1] for entry in sampled_paths], out=offsets[1:])
+    
+    # Sample every path into one raw buffer first; the bounding box is then just a
+    # min/max over it instead of a per-segment path.bbox() pass
+    raw = np.empty(offsets[-1], dtype=complex)
+    for i, (path, coeffs, seg_fractions, num_points) in enumerate(sampled_paths):
+        ts = np.arange(num_points) / (num_points - 1)
+        raw[offsets[i]:offsets[i + 1]] = _sample_path(path, coeffs, seg_fractions, ts)
+        
+    min_x, max_x = raw.real.min(), raw.real.max()
+    min_y, max_y = raw.imag.min(), raw.imag.max()
+    
     # Calculate center and scale
     center_x = (max_x + min_x) / 2
     center_y = (max_y + min_y) / 2
@@ -47,33 +78,123 @@ def parse_svg(file_path, points_per_unit=100):
     
     if scale == 0:
         scale = 1 # Avoid division by zero for single point
+        
+    # Normalize and flip Y (SVG y-axis is down, oscilloscope is usually up, 
+    # but usually we want to preserve visual orientation, so we flip Y relative to center)
+    # Actually, standard math plot is Y up. SVG is Y down.
+    # To look "correct" on a scope (y-up), we should invert the SVG Y coordinate.
+    points = np.empty((offsets[-1], 2), dtype=np.float32)
+    points[:, 0] = (raw.real - center_x) / scale
+    points[:, 1] = -(raw.imag - center_y) / scale # Invert Y for oscilloscope display
+        
+    return points, offsets
+
+def pack_paths(paths):
+    """
+    Packs a list of (N, 2) point arrays into the (points, offsets) form returned by parse_svg.
+    """
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum([len(path) for path in paths], out=offsets[1:])
+    if not paths:
+        return np.empty((0, 2), dtype=np.float32), offsets
+    return np.concatenate(paths).astype(np.float32), offsets
+
+def _segment_coefficients(path):
+    """
+    Returns the cubic power-basis coefficients of every segment of an svgpathtools Path.
     
-    extracted_paths = []
+    Row k holds (a, b, c, d) with segment k at t equal to a t^3 + b t^2 + c t + d.
+    Lines and quadratics are degree-elevated to cubics, which keeps both the curve
+    and its parametrization. Arcs have no polynomial form and get NaN rows.
     
-    for path in paths:
-        length = path.length()
-        if length == 0:
-            continue
-            
-        # Determine number of points based on length
-        num_points = max(2, int(length * points_per_unit))
+    Returns:
+        np.ndarray: Complex (S, 4) array.
+    """
+    nan = complex('nan')
+    controls = []
+    for segment in path:
+        if isinstance(segment, CubicBezier):
+            controls.append(segment.bpoints())
+        elif isinstance(segment, QuadraticBezier):
+            p0, p1, p2 = segment.bpoints()
+            controls.append((p0, p0 + 2 / 3 * (p1 - p0), p2 + 2 / 3 * (p1 - p2), p2))
+        elif isinstance(segment, Line):
+            p0, p1 = segment.start, segment.end
+            controls.append((p0, p0 + (p1 - p0) / 3, p0 + 2 * (p1 - p0) / 3, p1))
+        else:
+            controls.append((nan, nan, nan, nan))
+    return np.array(controls, dtype=complex).reshape(-1, 4) @ _CUBIC_BASIS.T
+
+def _segment_lengths(path, coeffs):
+    """
+    Returns the length of every segment of an svgpathtools Path.
+    
+    All polynomial segments are integrated together with a fixed Gauss-Legendre rule
+    in NumPy, instead of svgpathtools' per-segment adaptive quadrature with a Python
+    callback. The rule is checked against a refined one; segments where it hasn't
+    converged, and arcs (rare), keep svgpathtools' length().
+    
+    Args:
+        path (svgpathtools.Path): The path.
+        coeffs (np.ndarray): Its segment coefficients from _segment_coefficients.
+    """
+    a, b, c = coeffs[:, 0:1], coeffs[:, 1:2], coeffs[:, 2:3]
+    speed = np.abs((3 * a * _QUAD_T + 2 * b) * _QUAD_T + c)
+    lengths = speed @ _QUAD_W
+    speed = np.abs((3 * a * _QUAD_T_FINE + 2 * b) * _QUAD_T_FINE + c)
+    refined = speed @ _QUAD_W_FINE
+    
+    # NaN lengths (arcs) fail the comparison too
+    converged = np.abs(lengths - refined) <= LENGTH_RTOL * refined
+    for k in np.flatnonzero(~converged):
+        refined[k] = path[k].length()
         
-        # Sample points
-        path_points = []
-        for i in range(num_points):
-            t = i / (num_points - 1)
-            point = path.point(t)
-            
-            # Normalize and flip Y (SVG y-axis is down, oscilloscope is usually up, 
-            # but usually we want to preserve visual orientation, so we flip Y relative to center)
-            # Actually, standard math plot is Y up. SVG is Y down.
-            # To look "correct" on a scope (y-up), we should invert the SVG Y coordinate.
-            
-            x = (point.real - center_x) / scale
-            y = -(point.imag - center_y) / scale # Invert Y for oscilloscope display
-            
-            path_points.append([x, y])
-            
-        extracted_paths.append(np.array(path_points))
+    return refined
+
+def _sample_path(path, coeffs, seg_fractions, ts):
+    """
+    Evaluates path.point(t) for a whole sorted array of t values at once.
+    
+    Mirrors svgpathtools' Path.point: each t is mapped to a segment by its share
+    of the path length, and every segment is evaluated once on all of its local
+    parameters: polynomial segments from their power-basis coefficients, arcs
+    with svgpathtools' point().
+    
+    Args:
+        path (svgpathtools.Path): Path to sample.
+        coeffs (np.ndarray): Its segment coefficients from _segment_coefficients.
+        seg_fractions (np.ndarray): Length of each segment divided by the path length.
+        ts (np.ndarray): Sorted path parameters in [0, 1].
         
-    return extracted_paths
+    Returns:
+        np.ndarray: Complex points, one per t.
+    """
+    seg_ends = np.cumsum(seg_fractions)
+    seg_starts = seg_ends - seg_fractions
+    
+    # First segment whose end reaches t; t == 0 and t == 1 map to the path's endpoints
+    seg_idx = np.searchsorted(seg_ends, ts)
+    np.minimum(seg_idx, len(path) - 1, out=seg_idx)
+    seg_idx[ts == 0] = 0
+    seg_idx[ts == 1] = len(path) - 1
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        local_ts = (ts - seg_starts[seg_idx]) / seg_fractions[seg_idx]
+    local_ts[ts == 0] = 0
+    local_ts[ts == 1] = 1
+    
+    points = np.empty(len(ts), dtype=complex)
+    # ts is sorted, so each segment owns a contiguous run of samples
+    bounds = np.searchsorted(seg_idx, np.arange(len(path) + 1))
+    for k, (a, b, c, d) in enumerate(coeffs):
+        lo, hi = bounds[k], bounds[k + 1]
+        if hi == lo:
+            continue
+        t = local_ts[lo:hi]
+        if np.isnan(a):
+            points[lo:hi] = path[k].point(t)
+        else:
+            # Horner evaluation of the segment polynomial
+            points[lo:hi] = ((a * t + b) * t + c) * t + d
+    
+    return points